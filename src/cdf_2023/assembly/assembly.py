@@ -11,6 +11,7 @@ from copy import deepcopy
 from compas.geometry import Frame, Vector, Plane
 from compas.geometry import Transformation, Translation, Rotation
 from compas.geometry import intersection_line_plane
+from compas.geometry import multiply_matrices
 from compas.geometry import distance_point_point, distance_line_line, distance_point_line
 from compas.datastructures import Network, mesh_offset
 from compas.artists import Artist
@@ -26,12 +27,30 @@ from .element import Element
 
 from .utilities import FromToData
 from .utilities import FromToJson
+from .utilities import aabb_overlap
+from .utilities import distance_segment_segment
+from .utilities import dump_data
 from .utilities import element_to_INCON
+from .utilities import element_to_INCON_json
+from .utilities import matrix_from_axis_angle_translation
 from .utilities import tag_to_INCON
 
 __all__ = ['Assembly']
 
 
+# (open connector of the current element, flip) -> connectors to close on
+# the (previous element, new element) of a unit
+FLIP_TABLE = {
+    (2, 'AA'): (2, 2),
+    (2, 'AB'): (2, 1),
+    (2, 'BA'): (1, 2),
+    (2, 'BB'): (1, 1),
+    (1, 'AA'): (1, 1),
+    (1, 'AB'): (1, 2),
+    (1, 'BA'): (2, 1),
+    (1, 'BB'): (2, 2),
+}
+
 
 class Assembly(FromToData, FromToJson):
     """A data structure for discrete element assemblies.
@@ -75,6 +94,11 @@ class Assembly(FromToData, FromToJson):
         self.network.attributes.update({
             'name' : 'Assembly'})
 
+        # flat (key, x, y, z) records of the open connectors
+        self._open_connectors = None
+        # (cell size, {cell: record indices}) grid over the open connectors
+        self._connector_grid = None
+
         if attributes is not None:
             self.network.attributes.update(attributes)
 
@@ -111,6 +135,11 @@ class Assembly(FromToData, FromToJson):
     def name(self, value):
         self.network.attributes['name'] = value
 
+    def _invalidate_caches(self):
+        """Reset the cached open connectors after the elements changed."""
+        self._open_connectors = None
+        self._connector_grid = None
+
     def number_of_elements(self):
         """Compute the number of elements of the assembly.
 
@@ -181,10 +210,12 @@ class Assembly(FromToData, FromToJson):
                     vdata['robot_AB_base_frame'] = Frame.from_data(vdata['robot_AB_base_frame']) #node[vkey]['frame_measured'].to_data()
 
         self.network = Network.from_data(data)
+        self._invalidate_caches()
 
     def clear(self):
         """Clear all the assembly data."""
         self.network.clear()
+        self._invalidate_caches()
 
     def add_element(self, element, key=None, attr_dict={}, **kwattr):
         """Add an element to the assembly.
@@ -205,6 +236,7 @@ class Assembly(FromToData, FromToJson):
         x, y, z = element.frame.point
         key = self.network.add_node(key=key, attr_dict=attr_dict,
                                     x=x, y=y, z=z, element=element)
+        self._invalidate_caches()
         return key
 
 
@@ -253,26 +285,30 @@ class Assembly(FromToData, FromToJson):
             a = b = 1*c
 
         new_elem = current_elem.copy()
+        new_elem.connector_1_state = new_elem.connector_2_state = True
 
         if placed_by == 'robot':
-            R1 = Rotation.from_axis_and_angle(current_connector_frame.zaxis, math.radians(120), current_connector_frame.point)
-            T1 = Translation.from_vector(-new_elem.frame.xaxis*a*((length-rf_unit_radius+rf_unit_offset)/2.))
+            rotation_angle = 120
+            offset = a
         else:
-            R1 = Rotation.from_axis_and_angle(current_connector_frame.zaxis, math.radians(240), current_connector_frame.point)
-            T1 = Translation.from_vector(-new_elem.frame.xaxis*b*((length-rf_unit_radius+rf_unit_offset)/2.))
+            rotation_angle = 240
+            offset = b
 
-        new_elem.transform(R1*T1)
+        M1 = matrix_from_axis_angle_translation(current_connector_frame.zaxis,
+                                                math.radians(rotation_angle),
+                                                current_connector_frame.point,
+                                                -new_elem.frame.xaxis*offset*((length-rf_unit_radius+rf_unit_offset)/2.))
 
         # Define a desired rotation around the parent element
-        T_point = Translation.from_vector(current_elem.frame.xaxis)
-        new_point = current_elem.frame.point.transformed(T_point)
-        R2 = Rotation.from_axis_and_angle(current_elem.frame.xaxis, math.radians(angle), new_point)
+        # and a desired shift value along the parent element
+        new_point = current_elem.frame.point + current_elem.frame.xaxis
+        M2 = matrix_from_axis_angle_translation(current_elem.frame.xaxis,
+                                                math.radians(angle),
+                                                new_point,
+                                                current_elem.frame.xaxis*shift_value)
 
-        # Define a desired shift value along the parent element
-        T3 = Translation.from_vector(current_elem.frame.xaxis*shift_value)
-
-        # Transform the new element
-        new_elem.transform(R2*T3)
+        # Transform the new element once with the composed transformation
+        new_elem.transform(Transformation.from_matrix(multiply_matrices(M2, M1)))
 
         self.add_element(new_elem,
                          placed_by=placed_by,
@@ -300,6 +336,8 @@ class Assembly(FromToData, FromToJson):
             else:
                 current_elem.connector_2_state = False
 
+        self._invalidate_caches()
+
         return new_elem
 
     def add_connection(self, u, v, attr_dict=None, **kwattr):
@@ -342,6 +380,7 @@ class Assembly(FromToData, FromToJson):
         """
         for _k, element in self.elements(data=False):
             element.transform(transformation)
+        self._invalidate_caches()
 
     def transformed(self, transformation):
         """Returns a transformed copy of this assembly.
@@ -354,16 +393,45 @@ class Assembly(FromToData, FromToJson):
         -------
         Assembly
         """
-        assembly = self.copy()
-        assembly.transform(transformation)
-        assembly.network.transform(transformation)
-        return assembly
+        return self._copy(transformation)
 
     def copy(self):
         """Returns a copy of this assembly.
+
+        Elements and frames stored on the nodes are cloned directly,
+        without a round-trip through the data representation.
+        """
+        return self._copy()
+
+    def _copy(self, transformation=None):
+        """Copy the assembly, transforming the copied elements if a
+        transformation is given.
         """
         cls = type(self)
-        return cls.from_data(deepcopy(self.data))
+        assembly = cls()
+        network = assembly.network
+
+        network.attributes.update(deepcopy(self.network.attributes))
+        network.default_node_attributes.update(deepcopy(self.network.default_node_attributes))
+        network.default_edge_attributes.update(deepcopy(self.network.default_edge_attributes))
+
+        for key in self.network.nodes():
+            attr = {}
+            for name, value in self.network.node[key].items():
+                if isinstance(value, (Element, Frame)):
+                    attr[name] = value.copy()
+                else:
+                    attr[name] = deepcopy(value)
+            if transformation is not None:
+                element = attr['element']
+                element.transform(transformation)
+                attr['x'], attr['y'], attr['z'] = element.frame.point
+            network.add_node(key=key, attr_dict=attr)
+
+        for u, v in self.network.edges():
+            network.add_edge(u, v, attr_dict=deepcopy(self.network.edge[u][v]))
+
+        return assembly
 
     def element(self, key, data=False):
         """Get an element by its key."""
@@ -392,8 +460,9 @@ class Assembly(FromToData, FromToJson):
             for vkey, vattr in self.network.nodes(True):
                 yield vkey, vattr['element'], vattr
         else:
-            for vkey in self.network.nodes(data):
-                yield vkey, self.network.node[vkey]['element']
+            # the raw node dicts hold the element, no attribute view needed
+            for vkey, vattr in self.network.node.items():
+                yield vkey, vattr['element']
 
     def connections(self, data=False):
         """Iterate over the connections of the network.
@@ -425,23 +494,37 @@ class Assembly(FromToData, FromToJson):
 
     def collision_check(self, current_key, option_elems, tolerance):
         """Check for collisions with previously built elements.
+
+        Element pairs whose bounding boxes are further apart than the
+        collision threshold are skipped without measuring their distance,
+        and the check stops at the first colliding pair. Distances between
+        the straight element axes are computed analytically.
+
+        Returns
+        -------
+        tuple
+            (collision, dist). If a collision is found, dist is the smallest
+            distance measured up to the first colliding pair, which is below
+            the collision threshold. Otherwise dist is the smallest distance
+            among the pairs whose bounding boxes are within range, all of them
+            at or above the threshold, or ``float('inf')`` if every pair was
+            skipped. Skipped pairs are always further apart than the threshold.
         """
+        threshold = self.globals['rod_radius'] * 2. + 0.015 + tolerance
 
-        collision = False
-        results = []
-        dist_list = []
+        dist = float('inf')
         for key, elem in self.elements():
-            if key != current_key:
-                line1 = Artist(elem.line).draw()
-                for option_elem in option_elems:
-                    line2 = Artist(option_elem.line).draw()
-                    #results.append(True if distance_line_line(elem.line, option_elem.line, tol = 0.001) < assembly.globals['rod_radius']*2. + tolerance else False)
-                    distance = self.shortest_distance_between_two_lines(line1, line2)
-                    results.append(True if distance < (self.globals['rod_radius'] * 2. + 0.015 + tolerance) else False)
-                    dist_list.append(distance)
-                collision = True if True in results else False
-                dist = min(dist_list)
-        return collision, dist
+            if key == current_key:
+                continue
+            for option_elem in option_elems:
+                if not aabb_overlap(elem.aabb, option_elem.aabb, threshold):
+                    continue
+                distance = distance_segment_segment(elem.line.start, elem.line.end,
+                                                    option_elem.line.start, option_elem.line.end)
+                dist = min(dist, distance)
+                if distance < threshold:
+                    return True, dist
+        return False, dist
 
     def check_ground_collision(self, option_elems):
         """Check if an element touches the ground.
@@ -540,6 +623,7 @@ class Assembly(FromToData, FromToJson):
 
         T1 = Transformation.from_frame_to_frame(Frame.worldXY(), elem_frame)
         new_elem = elem.transformed(T1)
+        new_elem.connector_1_state = new_elem.connector_2_state = True
         T2 = Translation.from_vector(elem_frame.xaxis * shift_value)
         new_elem.transform(T2)
 
@@ -575,42 +659,36 @@ class Assembly(FromToData, FromToJson):
         if allow_temp_support == True:
             s_glob = True
 
-        e = [element.line for key, element in self.elements()]
-        e += [elem_option.line for elem_option in option_elems]
-
         supports.append(support)
-        supports.extend(e)
-        e = supports
 
-        for i, element in enumerate(e):
-            if i == 0:
-                #print element
-                voll = rs.SurfaceVolume(element)[0] # volume Vector of base; Material weight is considered as constant; Input as Brep
-                cenl = rs.SurfaceVolumeCentroid(element)[0] # center node
-                cenl = (cenl[0], cenl[1], 0) # planar Center-nodes
-            else:
-                voll = element.length *  math.pi * radius**2 # volume Vector for Rods; Material weight is considered as constant; Input as Line
-                cenl = (element.midpoint.x, element.midpoint.y, element.midpoint.z) # center nodes
-                cenl = (cenl[0], cenl[1], 0) # planar Center-nodes
+        props = rg.VolumeMassProperties.Compute(support) # volume and centroid in one pass; Input as Brep
+        vol.append(props.Volume) # volume Vector of base; Material weight is considered as constant
+        cen.append((props.Centroid.X, props.Centroid.Y, 0)) # planar Center-nodes
+
+        # Built elements reuse their cached values, options are computed fresh
+        e = [element for key, element in self.elements()]
+        e += list(option_elems)
+
+        for element in e:
+            voll, cenl = element.equilibrium_geometry(radius)
             vol.append(voll)
             cen.append(cenl)
 
 
         # Global Equlibrium
+        sum_vol = 0
         res_pos_x = 0
         res_pos_y = 0
 
-        for i in range(len(e)):
-            m_x = cen[i][0] * vol[i]
-            m_y = cen[i][1] * vol[i]
+        for i in range(len(vol)):
+            # running sums keep the resultant update O(1) per element
+            sum_vol += vol[i]
+            res_pos_x += cen[i][0] * vol[i]
+            res_pos_y += cen[i][1] * vol[i]
 
-            res_pos_x += m_x
-            res_pos_y += m_y
+            res_pos_x_loc = res_pos_x / sum_vol #moment in x-dir
+            res_pos_y_loc = res_pos_y / sum_vol #moment in y-dir
 
-            res_pos_x_loc = res_pos_x / sum(vol[:(i+1)]) #moment in x-dir
-            res_pos_y_loc = res_pos_y / sum(vol[:(i+1)]) #moment in y-dir
-
-            res_loc = rs.AddLine((res_pos_x_loc, res_pos_y_loc, 0), (res_pos_x_loc, res_pos_y_loc, sum(vol[:(i+1)]))) #Resultant
             se_loc = rg.Brep.IsPointInside(supports[0], rg.Point3d(res_pos_x_loc, res_pos_y_loc, 0), 0.001, False)
 
             if s_glob == True and allow_temp_support == False:
@@ -631,7 +709,8 @@ class Assembly(FromToData, FromToJson):
                 s_int = i
                 msg = "Structure is only in Equilibrium if Robot holds the last Element."
 
-            res = res_loc
+        # only the final resultant is returned, so draw it once
+        res = rs.AddLine((res_pos_x_loc, res_pos_y_loc, 0), (res_pos_x_loc, res_pos_y_loc, sum_vol)) #Resultant
 
     #        if static_equilibrium == False:
     #            break
@@ -874,6 +953,7 @@ class Assembly(FromToData, FromToJson):
         self.network.add_edge(N-2, N-1, edge_to='neighbour')
         self.network.add_edge(N-2, keys_pair[1], edge_to='neighbour')
         self.network.add_edge(N-1, keys_pair[1], edge_to='neighbour')
+        self._invalidate_caches()
 
         keys_dict = {'keys_human': keys_human, 'keys_robot':keys_robot}
 
@@ -881,54 +961,78 @@ class Assembly(FromToData, FromToJson):
 
     def parent_key(self, point, within_dist):
         """Return the parent key of a tracked object.
-        """
-        parent_key = None
-
-        for key, element in self.elements():
-            connectors = element.connectors(state='open')
-            for connector in connectors:
-                dist = distance_point_point(point, connector.point)
-                if dist < within_dist:
-                    parent_key = key
-
-        return parent_key
 
+        Open connectors are bucketed in a grid with cells of size
+        ``within_dist``, so only the 27 cells around the point are searched.
+
+        Notes
+        -----
+        The open connectors are cached and refreshed only when the assembly
+        is changed through its own methods (e.g. ``add_element``,
+        ``add_rf_unit_element``, ``update_connectors_states``,
+        ``range_filter``, ``transform``). Connector states changed or
+        elements moved directly through ``assembly.element(key)`` are not
+        seen until then.
+        """
+        if within_dist <= 0:
+            return None
+
+        if self._open_connectors is None:
+            self._open_connectors = []
+            for key, element in self.elements():
+                for connector in element.connectors(state='open'):
+                    x, y, z = connector.point
+                    self._open_connectors.append((key, x, y, z))
+
+        if self._connector_grid is None or self._connector_grid[0] != within_dist:
+            cells = {}
+            for index, (_, x, y, z) in enumerate(self._open_connectors):
+                cell = (int(math.floor(x / within_dist)),
+                        int(math.floor(y / within_dist)),
+                        int(math.floor(z / within_dist)))
+                cells.setdefault(cell, []).append(index)
+            self._connector_grid = (within_dist, cells)
+
+        cells = self._connector_grid[1]
+        px, py, pz = point
+        cx = int(math.floor(px / within_dist))
+        cy = int(math.floor(py / within_dist))
+        cz = int(math.floor(pz / within_dist))
+        within_dist_sq = within_dist**2
+
+        # the last matching connector wins, as in a full scan
+        last = -1
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                for k in (cz - 1, cz, cz + 1):
+                    for index in cells.get((i, j, k), ()):
+                        _, x, y, z = self._open_connectors[index]
+                        if index > last and (x - px)**2 + (y - py)**2 + (z - pz)**2 < within_dist_sq:
+                            last = index
+
+        if last < 0:
+            return None
+        return self._open_connectors[last][0]
 
     def update_connectors_states(self, current_key, flip, my_new_elem, unit_index):
+        """Close the connectors joined by the second element of a unit.
+        """
+        self._invalidate_caches()
 
+        if unit_index != 1:
+            return
 
-        key_index = self.network.key_index()
         current_elem = self.network.node[current_key]['element']
-        keys = [key_index[key] for key in self.network.nodes()]
+        keys = list(self.network.nodes())
         previous_elem = self.network.node[keys[-2]]['element']
 
-        if unit_index == 1:
-            if current_elem.connector_2_state:
-                if flip == 'AA':
-                    previous_elem.connector_2_state = False
-                    my_new_elem.connector_2_state = False
-                if flip == 'AB':
-                    previous_elem.connector_2_state = False
-                    my_new_elem.connector_1_state = False
-                if flip == 'BA':
-                    previous_elem.connector_1_state = False
-                    my_new_elem.connector_2_state = False
-                if flip == 'BB':
-                    previous_elem.connector_1_state = False
-                    my_new_elem.connector_1_state = False
-            if current_elem.connector_1_state:
-                if flip == 'AA':
-                    previous_elem.connector_1_state = False
-                    my_new_elem.connector_1_state = False
-                if flip == 'AB':
-                    previous_elem.connector_1_state = False
-                    my_new_elem.connector_2_state = False
-                if flip == 'BA':
-                    previous_elem.connector_2_state = False
-                    my_new_elem.connector_1_state = False
-                if flip == 'BB':
-                    previous_elem.connector_2_state = False
-                    my_new_elem.connector_2_state = False
+        open_connectors = [i for i, state in ((2, current_elem.connector_2_state),
+                                              (1, current_elem.connector_1_state)) if state]
+
+        for i in open_connectors:
+            previous_index, new_index = FLIP_TABLE[(i, flip)]
+            setattr(previous_elem, 'connector_{}_state'.format(previous_index), False)
+            setattr(my_new_elem, 'connector_{}_state'.format(new_index), False)
 
 
     def keys_within_radius(self, current_key):
@@ -948,75 +1052,97 @@ class Assembly(FromToData, FromToJson):
         ur_range_max = 1.3
         ur_range_min = 0.75
 
+        self._invalidate_caches()
+
+        # compare squared distances to skip the square root per connector
+        range_min_sq = ur_range_min**2
+        range_max_sq = ur_range_max**2
+        bx, by, bz = base_frame.point
+
         for key, element in self.elements():
             if element.connector_1_state == True:
-                distance = distance_point_point(element.connector_frame_1.point, base_frame.point)
-                if not ur_range_min <= distance <= ur_range_max:
+                x, y, z = element.connector_frame_1.point
+                distance_sq = (x - bx)**2 + (y - by)**2 + (z - bz)**2
+                if not range_min_sq <= distance_sq <= range_max_sq:
                     element.connector_1_state = False
             elif element.connector_2_state == True:
-                distance = distance_point_point(element.connector_frame_2.point, base_frame.point)
-                if not ur_range_min <= distance <= ur_range_max:
+                x, y, z = element.connector_frame_2.point
+                distance_sq = (x - bx)**2 + (y - by)**2 + (z - bz)**2
+                if not range_min_sq <= distance_sq <= range_max_sq:
                     element.connector_2_state = False
-            else:
-                pass
 
-    def distance_to_target_geo(self, key, angle, input_geo):
+    def probe_connector(self, key, angle, input_geo):
+        """Measure how an open connector relates to a target geometry.
 
-        open_connector_frame = self.element(key).connectors(state='open')[0]
-        elem_frame = self.element(key).frame
-
-        R = Rotation.from_axis_and_angle(elem_frame.xaxis, math.radians(angle), elem_frame.point)
-
-        open_connector_frame_copy = open_connector_frame.transformed(R)
-        open_connector_plane = Artist(open_connector_frame_copy).draw()
-
-        closest_point = input_geo.ClosestPoint(open_connector_plane.Origin)
-        distance = closest_point.DistanceTo(open_connector_plane.Origin)
-
-        vector = rg.Vector3d(closest_point) - rg.Vector3d(open_connector_plane.Origin)
-
-        return distance, vector
-
-    def orientation_to_target_geo(self, key, angle, input_geo):
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the element.
+        angle : float
+            Rotation of the connector around the element axis in degrees.
+        input_geo : Rhino geometry
+            The target geometry, anything with a ``ClosestPoint`` method.
 
-        open_connector_frame = self.element(key).connectors(state='open')[0]
-        elem_frame = self.element(key).frame
+        Returns
+        -------
+        tuple
+            (distance, vector, orientation, direction), where vector is the
+            :class:`Rhino.Geometry.Vector3d` from the connector to the closest
+            point, orientation is the absolute dot product of the connector's
+            z-axis and that direction times 100, and direction is the same
+            direction as a unit :class:`compas.geometry.Vector`.
+        """
+        element = self.element(key)
+        open_connector_frame = element.connectors(state='open')[0]
+        elem_frame = element.frame
 
         R = Rotation.from_axis_and_angle(elem_frame.xaxis, math.radians(angle), elem_frame.point)
 
         open_connector_frame_copy = open_connector_frame.transformed(R)
-        open_connector_plane = Artist(open_connector_frame_copy).draw()
+        origin = point_to_rhino(open_connector_frame_copy.point)
 
-        closest_point = input_geo.ClosestPoint(open_connector_plane.Origin)
+        closest_point = input_geo.ClosestPoint(origin)
+        distance = closest_point.DistanceTo(origin)
 
-        vector = Vector(closest_point.X, closest_point.Y, closest_point.Z) - open_connector_frame_copy.point
+        vector = rg.Vector3d(closest_point) - rg.Vector3d(origin)
+
+        direction = Vector(closest_point.X, closest_point.Y, closest_point.Z) - open_connector_frame_copy.point
 
         #angle = 180 - math.degrees(conn_frame_copy.zaxis.angle(vector))
         v1 = open_connector_frame_copy.zaxis
         v1.unitize()
-        vector.unitize()
-        dot_product = v1.dot(vector)
+        direction.unitize()
+        dot_product = v1.dot(direction)
+
+        return distance, vector, abs(dot_product)*100, direction
 
-        return abs(dot_product)*100, vector
+    def distance_to_target_geo(self, key, angle, input_geo):
+        """Returns the distance and vector from an open connector to a target geometry.
+        """
+        distance, vector, _, _ = self.probe_connector(key, angle, input_geo)
+        return distance, vector
+
+    def orientation_to_target_geo(self, key, angle, input_geo):
+        """Returns the orientation and direction of an open connector to a target geometry.
+        """
+        _, _, orientation, direction = self.probe_connector(key, angle, input_geo)
+        return orientation, direction
 
     def all_options_elements(self, flip, angle):
         """Returns a list of elements.
         """
-        keys = [key for key, element in self.elements()]
-        return [self.element(key).current_option_elements(self, flip, angle) for key in keys]
+        return [element.current_option_elements(self, flip, angle) for _, element in self.elements()]
 
 
     def all_options_vectors(self, len):
         """Returns a list of vectors.
         """
-        keys = [key for key, element in self.elements()]
-        return [self.element(key).current_option_vectors(len) for key in keys]
+        return [element.current_option_vectors(len) for _, element in self.elements()]
 
     def all_options_viz(self, rf_unit_radius):
         """Returns a list of frames.
         """
-        keys = [key for key, element in self.elements()]
-        return [self.element(key).current_option_viz(rf_unit_radius) for key in keys]
+        return [element.current_option_viz(rf_unit_radius) for _, element in self.elements()]
 
 
     def connectors(self, state='all'):
@@ -1038,8 +1164,9 @@ class Assembly(FromToData, FromToJson):
 
         """
         for key, element in self.elements():
-            if self.element(key).connectors(state):
-                yield key, element.connectors(state)
+            connectors = element.connectors(state)
+            if connectors:
+                yield key, connectors
 
         # keys = [key for key, element in self.elements()]
         # return [(key, self.element(key).connectors(state)) for key in keys]
@@ -1056,7 +1183,7 @@ class Assembly(FromToData, FromToJson):
             If 'open' : yeild all open connectors_ranges.
             If 'closed' : yeild all closed connectors_ranges.
 
-        Yieldsframe
+        Yields
         ------
         2-tuple
             The connectors as a (key, cone) tuple.
@@ -1100,7 +1227,7 @@ class Assembly(FromToData, FromToJson):
         exporter.delete_file()
         exporter.export_building_plan(building_plan)
 
-    def export_to_json_for_xr(self, path, is_built=False):
+    def export_to_json_for_xr(self, path, is_built=False, format='json'):
 
         self.network.update_default_node_attributes({"is_built":False,"idx_v":None,"custom_attr_1":None,"custom_attr_2":None,"custom_attr_3":None})
 
@@ -1109,19 +1236,34 @@ class Assembly(FromToData, FromToJson):
             self.network.node_attribute(key, "idx_v", idx_v)
             self.network.node_attribute(key, "is_built", is_built)
 
-        self.to_json(path)
+        self.to_json(path, format=format)
 
-    def export_to_json_incon(self, path, qr_code, starting_geometry=True, is_built=True, pretty=True):
+    def export_to_msgpack_for_xr(self, path, is_built=False):
+        """Export the assembly for the XR app as a binary msgpack file.
+
+        Writes the same data as :meth:`export_to_json_for_xr` in a smaller
+        file that loads faster. Prefer it when the client reads msgpack.
+        Requires the ``msgpack`` package.
+        """
+        self.export_to_json_for_xr(path, is_built, format='msgpack')
+
+    def export_to_json_incon(self, path, qr_code, starting_geometry=True, is_built=True, pretty=True, format='json'):
         buildingplan = {"id":"iaac_plan",'name':"iaac_plan", "description":"iaac_plan", "building_steps":[]}
         building_steps = []
         len = 0
 
+        # compact json: the uniform element records are formatted from a template
+        templated = format == 'json' and not pretty
+
         if starting_geometry:
             element_to_INCON("starting element", len, None, building_steps, True, "starting_material.obj")
             len += 1
 
-        for key, element, data in self.elements(data=True):
-            element_to_INCON("dynamic_cylinder", key, element, building_steps, True, "cylinder_for_iaac_workshop.obj")
+        for key, element in self.elements():
+            if templated:
+                element_to_INCON_json("dynamic_cylinder", key, element, building_steps, True, "cylinder_for_iaac_workshop.obj")
+            else:
+                element_to_INCON("dynamic_cylinder", key, element, building_steps, True, "cylinder_for_iaac_workshop.obj")
 
         placeholder = {"type":"object",'object_type':"cylinder_for_iaac_workshop_1m.obj", "id": "dynamic_cylinder", "is_tag": False, "is_already_built": False, "color_rgb": [1.0, 0.0, 0.0],"instances": 200,"build_instructions" : []}
         building_steps.append(placeholder)
@@ -1129,8 +1271,17 @@ class Assembly(FromToData, FromToJson):
         for key, tag in enumerate(qr_code):
             tag_to_INCON(key, tag, building_steps)
 
+        if templated:
+            # only the irregular records go through the json encoder
+            steps = [json.dumps(step) if isinstance(step, dict) else step for step in building_steps]
+            del buildingplan['building_steps']
+            header = json.dumps(buildingplan)
+            with open(path, 'w') as fp:
+                fp.write('{}, "building_steps": [{}]}}'.format(header[:-1], ', '.join(steps)))
+            return
+
         buildingplan['building_steps'] = building_steps
-        compas.json_dump(buildingplan, path, pretty)
+        dump_data(buildingplan, path, pretty, format)
 
 
     def assembly_to_json(self, path, pretty):
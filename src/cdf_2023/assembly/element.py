@@ -70,6 +70,8 @@ class Element(object):
         self.connector_2_state = True
         self.joint_frame_1 = None
         self.joint_frame_2 = None
+        self._aabb = None
+        self._eq_cache = None
         self.line = None
         self._type = ''
         self._base_frame = None
@@ -232,6 +234,59 @@ class Element(object):
     def frame(self, frame):
         self._frame = frame.copy()
 
+    @property
+    def line(self):
+        """Axis line of the element."""
+        return self._line
+
+    @line.setter
+    def line(self, line):
+        self._line = line
+        self._aabb = None
+        self._eq_cache = None
+
+    @property
+    def aabb(self):
+        """Axis-aligned bounding box of the element's line.
+
+        The box is cached and recomputed only after the line is replaced
+        or the element is transformed.
+
+        Returns
+        -------
+        tuple
+            The box as (xmin, ymin, zmin, xmax, ymax, zmax),
+            or ``None`` if the element has no line.
+        """
+        if self._aabb is None and self.line:
+            x1, y1, z1 = self.line.start
+            x2, y2, z2 = self.line.end
+            self._aabb = (min(x1, x2), min(y1, y2), min(z1, z2),
+                          max(x1, x2), max(y1, y2), max(z1, z2))
+        return self._aabb
+
+    def equilibrium_geometry(self, radius):
+        """Volume and planar centroid of the element's rod for equilibrium checks.
+
+        The values are cached and recomputed only after the line is replaced,
+        the element is transformed or a different radius is requested.
+
+        Parameters
+        ----------
+        radius : float
+            The radius of the rod.
+
+        Returns
+        -------
+        tuple
+            The volume and the centroid projected to the XY-plane as (x, y, 0).
+        """
+        if self._eq_cache is None or self._eq_cache[0] != radius:
+            volume = self.line.length * math.pi * radius**2
+            midpoint = self.line.midpoint
+            self._eq_cache = (radius, volume, (midpoint.x, midpoint.y, 0))
+        return self._eq_cache[1:]
+
     @property
     def tool_frame(self):
         """tool frame of the element"""
@@ -511,6 +566,8 @@ class Element(object):
             self.connector_range_2.transform(transformation)
         if self.line:
             self.line.transform(transformation)
+            self._aabb = None
+            self._eq_cache = None
         if self.joint_frame_1:
             self.joint_frame_1.transform(transformation)
         if self.joint_frame_2:
@@ -569,10 +626,8 @@ class Element(object):
             elem.connector_range_1 = self.connector_range_1.copy()
         if self.connector_range_2:
             elem.connector_range_2 = self.connector_range_2.copy()
-        if self.connector_1_state:
-            elem.connector_1_state = self.connector_1_state
-        if self.connector_2_state:
-            elem.connector_2_state = self.connector_2_state
+        elem.connector_1_state = self.connector_1_state
+        elem.connector_2_state = self.connector_2_state
         if self.line:
             elem.line = self.line.copy()
         if self.joint_frame_1:
@@ -589,6 +644,8 @@ class Element(object):
             elem._source = self._source.copy()
         if self._mesh:
             elem._mesh = self._mesh.copy()
+        if self.trajectory:
+            elem.trajectory = [t.copy() for t in self.trajectory]
         if self.path:
             elem.path = [f.copy() for f in self.path]
 
@@ -677,6 +734,8 @@ class Element(object):
             R2 = Rotation.from_axis_and_angle(current_connector_frame.zaxis, math.radians(240), current_connector_frame.point)
             e1 = self.transformed(R1)
             e2 = self.transformed(R2)
+            e1.connector_1_state = e1.connector_2_state = True
+            e2.connector_1_state = e2.connector_2_state = True
 
             # T_point = Translation.from_vector(self.frame.xaxis)
             # new_point = self.frame.point.transformed(T_point)
@@ -3,13 +3,26 @@ from __future__ import absolute_import
 from __future__ import division
 
 import json
+import math
 import compas
 
+from compas.geometry import normalize_vector
+
 try:
     basestring
 except NameError:
     basestring = str
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 
 __all__ = [
     'FromToData',
@@ -93,15 +106,21 @@ class FromToJson(object):
         graph.data = data
         return graph
 
-    def to_json(self, filepath, pretty=False):
+    def to_json(self, filepath, pretty=False, format='json'):
         """Serialise the structured data representing the data structure to json.
 
         Parameters
         ----------
         filepath : str
             The path to the json file.
+        format : str, optional
+            The writer to use, see :func:`dump_data`.
 
         """
+        if format != 'json':
+            dump_data(self.data, filepath, pretty, format)
+            return
+
         with open(filepath, 'w+') as fp:
             if pretty:
                 #json.dump(self.data, fp, sort_keys=True, indent=4) # old
@@ -152,36 +171,213 @@ class FromToPickle(object):
         self.dump(filepath)
 
 
+def distance_segment_segment(a, b, c, d, tol=1e-12):
+    """Compute the shortest distance between two line segments.
+
+    Parameters
+    ----------
+    a, b : point
+        Start and end point of the first segment.
+    c, d : point
+        Start and end point of the second segment.
+    tol : float, optional
+        Squared length below which a segment is treated as a point.
+
+    Returns
+    -------
+    float
+        The distance between the closest points of the segments.
+
+    Notes
+    -----
+    Closest points are found from the clamped segment parameters, as in
+    Ericson, *Real-Time Collision Detection*, section 5.1.9.
+    """
+    u = [b[i] - a[i] for i in range(3)]
+    v = [d[i] - c[i] for i in range(3)]
+    w = [a[i] - c[i] for i in range(3)]
+
+    uu = u[0] * u[0] + u[1] * u[1] + u[2] * u[2]
+    vv = v[0] * v[0] + v[1] * v[1] + v[2] * v[2]
+    vw = v[0] * w[0] + v[1] * w[1] + v[2] * w[2]
+
+    if uu <= tol and vv <= tol:
+        s = t = 0.
+    elif uu <= tol:
+        s = 0.
+        t = min(max(vw / vv, 0.), 1.)
+    else:
+        uw = u[0] * w[0] + u[1] * w[1] + u[2] * w[2]
+        if vv <= tol:
+            t = 0.
+            s = min(max(-uw / uu, 0.), 1.)
+        else:
+            uv = u[0] * v[0] + u[1] * v[1] + u[2] * v[2]
+            denom = uu * vv - uv * uv
+            # parallel segments: any point of the first one will do
+            s = min(max((uv * vw - uw * vv) / denom, 0.), 1.) if denom > tol else 0.
+            t = (uv * s + vw) / vv
+            if t < 0.:
+                t = 0.
+                s = min(max(-uw / uu, 0.), 1.)
+            elif t > 1.:
+                t = 1.
+                s = min(max((uv - uw) / uu, 0.), 1.)
+
+    dx = w[0] + u[0] * s - v[0] * t
+    dy = w[1] + u[1] * s - v[1] * t
+    dz = w[2] + u[2] * s - v[2] * t
+    return (dx * dx + dy * dy + dz * dz) ** 0.5
+
+def matrix_from_axis_angle_translation(axis, angle, point, vector):
+    """Construct the matrix of a translation followed by a rotation around an axis.
+
+    The result equals
+    ``Rotation.from_axis_and_angle(axis, angle, point) * Translation.from_vector(vector)``
+    without creating the intermediate transformations.
+
+    Parameters
+    ----------
+    axis : vector
+        The rotation axis.
+    angle : float
+        The rotation angle in radians.
+    point : point
+        A point on the rotation axis.
+    vector : vector
+        The translation applied before the rotation.
+
+    Returns
+    -------
+    list of list of float
+        The 4x4 transformation matrix.
+    """
+    x, y, z = normalize_vector(axis)
+    c = math.cos(angle)
+    s = math.sin(angle)
+    t = 1. - c
+
+    R = [[c + x * x * t, x * y * t - z * s, x * z * t + y * s],
+         [y * x * t + z * s, c + y * y * t, y * z * t - x * s],
+         [z * x * t - y * s, z * y * t + x * s, c + z * z * t]]
+
+    # x -> R (x + vector - point) + point
+    d = [vector[i] - point[i] for i in range(3)]
+    M = [R[i] + [R[i][0] * d[0] + R[i][1] * d[1] + R[i][2] * d[2] + point[i]] for i in range(3)]
+    M.append([0., 0., 0., 1.])
+    return M
+
+def dump_data(data, filepath, pretty=False, format='json'):
+    """Write a dictionary of plain data to a file.
+
+    Parameters
+    ----------
+    data : dict
+        The data to write.
+    filepath : str
+        The path to the file.
+    pretty : bool, optional
+        If ``True``, indent the output. Ignored for ``'msgpack'``.
+    format : str, optional
+        ``'json'`` writes with :func:`compas.json_dump`.
+        ``'orjson'`` writes the same JSON with the faster ``orjson`` encoder.
+        ``'msgpack'`` writes a smaller binary file with ``msgpack``.
+        The last two require the corresponding package to be installed.
+
+    """
+    if format == 'json':
+        compas.json_dump(data, filepath, pretty)
+    elif format == 'orjson':
+        if orjson is None:
+            raise ImportError("The 'orjson' format requires the orjson package.")
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(filepath, 'wb') as fp:
+            fp.write(orjson.dumps(data, option=option))
+    elif format == 'msgpack':
+        if msgpack is None:
+            raise ImportError("The 'msgpack' format requires the msgpack package.")
+        with open(filepath, 'wb') as fp:
+            fp.write(msgpack.packb(data, use_bin_type=True))
+    else:
+        raise ValueError("Unknown format: {}".format(format))
+
 def _serialize_to_data(obj):
     return dict(
         dtype='{}/{}'.format(obj.__class__.__module__, obj.__class__.__name__),
         data=obj.to_data()
     )
 
-def element_to_INCON(id_name, key, element, building_steps, is_built,name):
-        if element != None:
-            x,y,z,w,qx,qy,qz = element.get_pose_quaternion()
-            type = element.objecttype
-        else:
-            x,y,z,w,qx,qy,qz = 0,0,0,1,0,0,0
-            type = "object"
-        line = {
-            "id": str(id_name) + str(key),
-            'type':type,
-            "object_type":name,
-            "is_tag": False,
-            "pos.x": x,
-            "pos.y": y,
-            "pos.z": z,
-            "quat.w": w,
-            "quat.x": qx,
-            "quat.y": qy,
-            "quat.z": qz,
-            "is_already_built": is_built,
-            "color_rgb": [1.0, 0.0, 0.0],
-            "build_instructions": [],
-            }
-        building_steps.append(line)
+def aabb_overlap(a, b, margin=0.):
+    """Check if two axis-aligned bounding boxes overlap.
+
+    Parameters
+    ----------
+    a, b : tuple
+        Boxes as (xmin, ymin, zmin, xmax, ymax, zmax).
+    margin : float, optional
+        Distance by which the boxes are inflated before testing.
+
+    Returns
+    -------
+    bool
+        ``True`` if the inflated boxes overlap.
+    """
+    return (a[0] - margin <= b[3] and b[0] - margin <= a[3] and
+            a[1] - margin <= b[4] and b[1] - margin <= a[4] and
+            a[2] - margin <= b[5] and b[2] - margin <= a[5])
+
+
+def _pose_and_type(element):
+    """Return the INCON pose and type of an element, or the defaults for ``None``."""
+    if element is not None:
+        x, y, z, w, qx, qy, qz = element.get_pose_quaternion()
+        return x, y, z, w, qx, qy, qz, element.objecttype
+    return 0, 0, 0, 1, 0, 0, 0, "object"
+
+
+def element_to_INCON(id_name, key, element, building_steps, is_built, name):
+    x, y, z, w, qx, qy, qz, type = _pose_and_type(element)
+    line = {
+        "id": str(id_name) + str(key),
+        "type": type,
+        "object_type": name,
+        "is_tag": False,
+        "pos.x": x,
+        "pos.y": y,
+        "pos.z": z,
+        "quat.w": w,
+        "quat.x": qx,
+        "quat.y": qy,
+        "quat.z": qz,
+        "is_already_built": is_built,
+        "color_rgb": [1.0, 0.0, 0.0],
+        "build_instructions": [],
+    }
+    building_steps.append(line)
+
+
+# Same record as element_to_INCON, formatted without the json encoder
+ELEMENT_INCON_TEMPLATE = (
+    '{{"id": {id}, "type": {type}, "object_type": {name}, "is_tag": false, '
+    '"pos.x": {x!r}, "pos.y": {y!r}, "pos.z": {z!r}, '
+    '"quat.w": {w!r}, "quat.x": {qx!r}, "quat.y": {qy!r}, "quat.z": {qz!r}, '
+    '"is_already_built": {is_built}, "color_rgb": [1.0, 0.0, 0.0], "build_instructions": []}}'
+)
+
+
+def element_to_INCON_json(id_name, key, element, building_steps, is_built, name):
+    x, y, z, w, qx, qy, qz, type = _pose_and_type(element)
+    line = ELEMENT_INCON_TEMPLATE.format(
+        id=json.dumps(str(id_name) + str(key)),
+        type=json.dumps(type),
+        name=json.dumps(name),
+        x=x, y=y, z=z, w=w, qx=qx, qy=qy, qz=qz,
+        is_built='true' if is_built else 'false',
+    )
+    building_steps.append(line)
+
 
 def element_to_json(assembly):
     building_steps = {}
@@ -0,0 +1,52 @@
+import pytest
+
+# Element imports compas_rhino geometry, so this module only runs inside Rhino.
+pytest.importorskip('Rhino')
+pytest.importorskip('compas_fab')
+
+from compas.datastructures import Mesh  # noqa: E402
+from compas.geometry import Box, Frame, Line  # noqa: E402
+from compas_fab.robots import JointTrajectory, JointTrajectoryPoint  # noqa: E402
+from compas_rhino.geometry import RhinoNurbsSurface  # noqa: E402
+
+from cdf_2023.assembly import Element  # noqa: E402
+
+
+def _range_surface(x):
+    points = [[[x, 0, 0], [x, 1, 0]], [[x + 1, 0, 0], [x + 1, 1, 0]]]
+    return RhinoNurbsSurface.from_points(points, u_degree=1, v_degree=1)
+
+
+def _full_element():
+    frame = Frame([1, 2, 3], [1, 0, 0], [0, 1, 0])
+    box = Box(frame, 1, 0.1, 0.1)
+    elem = Element.from_shape(box, frame)
+    elem._mesh = Mesh.from_shape(box)
+    elem.tool_frame = Frame([1, 2, 4], [0, 1, 0], [1, 0, 0])
+    elem.trajectory = [JointTrajectory([JointTrajectoryPoint([0.1, 0.2], [0, 0])], ['j1', 'j2'])]
+    elem.path = [Frame.worldXY(), Frame([0, 0, 1], [1, 0, 0], [0, 1, 0])]
+    elem.connector_frame_1 = Frame([0, 2, 3], [1, 0, 0], [0, 1, 0])
+    elem.connector_frame_2 = Frame([2, 2, 3], [1, 0, 0], [0, 1, 0])
+    elem.connector_range_1 = _range_surface(0)
+    elem.connector_range_2 = _range_surface(2)
+    elem.connector_1_state = False
+    elem.connector_2_state = True
+    elem.line = Line([0.5, 2, 3], [1.5, 2, 3])
+    elem.joint_frame_1 = Frame([0.5, 2, 3], [1, 0, 0], [0, 1, 0])
+    elem.joint_frame_2 = Frame([1.5, 2, 3], [1, 0, 0], [0, 1, 0])
+    elem._type = 'rod'
+    elem._base_frame = Frame([0, 0, 0], [0, 1, 0], [1, 0, 0])
+    elem.RCF = Frame([1, 2, 3], [0, 0, 1], [0, 1, 0])
+    return elem
+
+
+def test_copy_matches_data_round_trip():
+    elem = _full_element()
+    assert elem.copy().data == Element.from_data(elem.data).data
+
+
+def test_copy_keeps_connector_states():
+    elem = _full_element()
+    copy = elem.copy()
+    assert copy.connector_1_state is False
+    assert copy.connector_2_state is True
@@ -0,0 +1,164 @@
+import importlib.util
+import math
+import os
+
+import pytest
+
+pytest.importorskip('compas')
+
+# Load the module on its own: the package __init__ imports Rhino-only modules.
+HERE = os.path.dirname(os.path.abspath(__file__))
+UTILITIES = os.path.join(HERE, '..', 'src', 'cdf_2023', 'assembly', 'utilities.py')
+
+spec = importlib.util.spec_from_file_location('cdf_2023_assembly_utilities', UTILITIES)
+utilities = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(utilities)
+
+
+def test_aabb_overlap_overlapping():
+    assert utilities.aabb_overlap((0, 0, 0, 1, 1, 1), (0.5, 0.5, 0.5, 2, 2, 2))
+    assert utilities.aabb_overlap((0, 0, 0, 2, 2, 2), (0.5, 0.5, 0.5, 1, 1, 1))
+
+
+def test_aabb_overlap_disjoint():
+    a = (0, 0, 0, 1, 1, 1)
+    assert not utilities.aabb_overlap(a, (2, 0, 0, 3, 1, 1))
+    assert not utilities.aabb_overlap(a, (0, -3, 0, 1, -2, 1))
+    assert not utilities.aabb_overlap(a, (0, 0, 1.5, 1, 1, 2))
+
+
+def test_aabb_overlap_touching():
+    assert utilities.aabb_overlap((0, 0, 0, 1, 1, 1), (1, 0, 0, 2, 1, 1))
+
+
+@pytest.mark.parametrize('axis', [0, 1, 2])
+def test_aabb_overlap_margin_boundary(axis):
+    a = (0, 0, 0, 1, 1, 1)
+    # b sits 0.5 beyond a along one axis
+    b = [0, 0, 0, 1, 1, 1]
+    b[axis], b[axis + 3] = 1.5, 2.5
+    assert utilities.aabb_overlap(a, b, margin=0.5)
+    assert utilities.aabb_overlap(b, a, margin=0.5)
+    assert not utilities.aabb_overlap(a, b, margin=0.25)
+    assert not utilities.aabb_overlap(b, a, margin=0.25)
+    assert not utilities.aabb_overlap(a, b)
+
+
+def test_distance_segment_segment_crossing():
+    d = utilities.distance_segment_segment([0, 0, 0], [1, 0, 0], [0.5, -1, 1], [0.5, 1, 1])
+    assert d == pytest.approx(1.0)
+
+
+def test_distance_segment_segment_intersecting():
+    d = utilities.distance_segment_segment([-1, 0, 0], [1, 0, 0], [0, -1, 0], [0, 1, 0])
+    assert d == pytest.approx(0.0)
+
+
+def test_distance_segment_segment_parallel():
+    d = utilities.distance_segment_segment([0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0])
+    assert d == pytest.approx(1.0)
+
+
+def test_distance_segment_segment_collinear_disjoint():
+    d = utilities.distance_segment_segment([0, 0, 0], [1, 0, 0], [2, 0, 0], [3, 0, 0])
+    assert d == pytest.approx(1.0)
+
+
+def test_distance_segment_segment_endpoint_closest():
+    d = utilities.distance_segment_segment([0, 0, 0], [1, 0, 0], [2, 1, 0], [2, 2, 0])
+    assert d == pytest.approx(math.sqrt(2))
+
+
+def test_distance_segment_segment_degenerate():
+    point = [0.5, 2, 0]
+    assert utilities.distance_segment_segment(point, point, [0, 0, 0], [1, 0, 0]) == pytest.approx(2.0)
+    assert utilities.distance_segment_segment([0, 0, 0], [1, 0, 0], point, point) == pytest.approx(2.0)
+    assert utilities.distance_segment_segment(point, point, [0.5, 0, 0], [0.5, 0, 0]) == pytest.approx(2.0)
+
+
+def _rotate(point, axis, angle, origin):
+    # Rodrigues' rotation of a point around an axis through origin
+    length = math.sqrt(sum(a * a for a in axis))
+    k = [a / length for a in axis]
+    v = [point[i] - origin[i] for i in range(3)]
+    kxv = [k[1] * v[2] - k[2] * v[1], k[2] * v[0] - k[0] * v[2], k[0] * v[1] - k[1] * v[0]]
+    kv = sum(k[i] * v[i] for i in range(3))
+    c, s = math.cos(angle), math.sin(angle)
+    return [origin[i] + v[i] * c + kxv[i] * s + k[i] * kv * (1 - c) for i in range(3)]
+
+
+@pytest.mark.parametrize('axis, angle, origin, vector', [
+    ([0, 0, 1], math.radians(120), [1, 2, 3], [0.5, 0, 0]),
+    ([1, 1, 0], math.radians(-35), [0, -1, 0.5], [0, 0, 0]),
+    ([0.3, -0.2, 0.9], math.radians(240), [0, 0, 0], [-1, 2, 0.25]),
+])
+def test_matrix_from_axis_angle_translation(axis, angle, origin, vector):
+    M = utilities.matrix_from_axis_angle_translation(axis, angle, origin, vector)
+    assert M[3] == [0., 0., 0., 1.]
+
+    for point in ([0, 0, 0], [1, 0, 0], [0.2, -0.7, 1.3]):
+        result = [sum(M[i][j] * c for j, c in enumerate(point + [1])) for i in range(3)]
+        expected = _rotate([point[i] + vector[i] for i in range(3)], axis, angle, origin)
+        assert result == pytest.approx(expected)
+
+
+def test_matrix_from_axis_angle_translation_matches_compas():
+    from compas.geometry import Rotation, Translation
+
+    axis, angle, origin, vector = [0.3, -0.2, 0.9], math.radians(75), [1, 0, -2], [0.4, 0.1, 0]
+    M = utilities.matrix_from_axis_angle_translation(axis, angle, origin, vector)
+    T = Rotation.from_axis_and_angle(axis, angle, origin) * Translation.from_vector(vector)
+
+    for row, expected in zip(M, T.matrix):
+        assert row == pytest.approx(expected)
+
+
+class _PoseElement(object):
+    objecttype = 'object'
+
+    def __init__(self, pose):
+        self.pose = pose
+
+    def get_pose_quaternion(self):
+        return list(self.pose)
+
+
+@pytest.mark.parametrize('element, is_built', [
+    (_PoseElement([0.1, 2, -3.0000001, 0.7071067811865476, 0, 0.7071067811865475, 0]), True),
+    (_PoseElement([1e-9, 12345.678, 0.0, 1.0, 0.0, 0.0, 0.0]), False),
+    (None, True),
+])
+def test_element_to_INCON_json_matches_json_dumps(element, is_built):
+    import json
+
+    records = []
+    templated = []
+    utilities.element_to_INCON('dynamic_cylinder', 7, element, records, is_built, 'cylinder.obj')
+    utilities.element_to_INCON_json('dynamic_cylinder', 7, element, templated, is_built, 'cylinder.obj')
+
+    assert templated == [json.dumps(records[0])]
+    assert json.loads(templated[0]) == records[0]
+
+
+def test_dump_data_orjson_round_trip(tmp_path):
+    pytest.importorskip('orjson')
+    import json
+
+    data = {'name': 'assembly', 'node': {'0': {'x': 0.1, 'is_built': True}}, 'edge': [[0, 1]], 'max_node': None}
+    filepath = str(tmp_path / 'data.json')
+    for pretty in (False, True):
+        utilities.dump_data(data, filepath, pretty=pretty, format='orjson')
+        with open(filepath, 'r') as fp:
+            assert json.load(fp) == data
+
+
+def test_dump_data_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        utilities.dump_data({}, str(tmp_path / 'data.xml'), format='xml')
+
+
+@pytest.mark.parametrize('module, format', [('orjson', 'orjson'), ('msgpack', 'msgpack')])
+def test_dump_data_missing_package(tmp_path, monkeypatch, module, format):
+    monkeypatch.setattr(utilities, module, None)
+    with pytest.raises(ImportError):
+        utilities.dump_data({}, str(tmp_path / 'data'), format=format)